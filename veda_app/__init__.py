@@ -1,2 +1,2 @@
 """VEDA App - Package init"""
-from .app import create_demo_interface, create_colab_interface
+from .app import create_demo_app, create_demo_interface, create_colab_interface
@@ -7,20 +7,56 @@ Run with:
     uvicorn veda_app.api:app --host 0.0.0.0 --port 8000
 """
 
-import uuid
+import gc
+import os
+import re
+import inspect
+import asyncio
 import time
+import secrets
+import itertools
 import logging
+import sqlite3
 import threading
+import multiprocessing as mp
 from pathlib import Path
 from typing import Optional
-from dataclasses import dataclass, field
-
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from functools import partial
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields, asdict, replace
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import orjson
+import msgspec
+import anyio.to_thread
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger("VEDA.api")
 
+# Worker threads available to sync handlers and FileResponse file I/O
+THREADPOOL_TOKENS = int(os.getenv("VEDA_THREADPOOL_TOKENS", "100"))
+
+# Job history lives on disk; only active jobs are cached in memory
+JOBS_DB = os.getenv("VEDA_JOBS_DB", "outputs/jobs.db")
+TERMINAL_STATUSES = ("completed", "failed")
+
+# Finished jobs (and their videos) are deleted this long after they finish
+JOB_TTL_SECONDS = int(os.getenv("VEDA_JOB_TTL", "3600"))
+REAP_INTERVAL_SECONDS = 300
+
+# Idle SSE streams send a comment this often so proxies keep them open
+SSE_KEEPALIVE_SECONDS = 15
+
+# Style presets are static — build the brain once, not per request
+try:
+    from veda_engine.core.prompt_brain import PromptBrain
+    _BRAIN = PromptBrain()
+except ImportError:
+    _BRAIN = None
+
 # ─── Pydantic Models ───────────────────────────────────────────
 
 class GenerateRequest(BaseModel):
@@ -39,8 +75,12 @@ class JobResponse(BaseModel):
     message: str
 
 
-class JobStatusResponse(BaseModel):
-    """Response for job status query."""
+class JobStatusResponse(msgspec.Struct):
+    """
+    Response for job status query.
+    A msgspec struct rather than a Pydantic model: this is the polling hot
+    path, and msgspec encodes straight to JSON bytes without validation.
+    """
     job_id: str
     status: str
     progress: Optional[str] = None
@@ -49,6 +89,9 @@ class JobStatusResponse(BaseModel):
     duration_seconds: Optional[float] = None
 
 
+_STATUS_ENCODER = msgspec.json.Encoder()
+
+
 class StylesResponse(BaseModel):
     """Response listing available styles."""
     styles: list
@@ -56,9 +99,14 @@ class StylesResponse(BaseModel):
 
 # ─── Job Store ─────────────────────────────────────────────────
 
-@dataclass
+@dataclass(frozen=True)
 class Job:
-    """Internal job tracking."""
+    """
+    Internal job tracking.
+
+    Immutable: updates swap in a new snapshot, so readers never see a
+    half-applied update and need no lock.
+    """
     job_id: str
     prompt: str
     style: str
@@ -70,84 +118,410 @@ class Job:
     error: Optional[str] = None
     created_at: float = field(default_factory=time.time)
     duration_seconds: float = 0.0
+    finished_at: Optional[float] = None
+
+
+_JOB_COLUMNS = tuple(f.name for f in fields(Job))
 
 
 class JobStore:
-    """Thread-safe in-memory job store."""
+    """
+    SQLite-backed job store.
+
+    Every job is persisted in a WAL-mode database, so memory stays bounded
+    no matter how many jobs the server has seen. Queued and running jobs
+    are also kept in a small in-memory cache so status polls for active
+    jobs never touch SQL; finished jobs are loaded on demand.
+    """
+
+    HOT_CACHE_SIZE = 128
+
+    def __init__(self, path: str = JOBS_DB):
+        self._path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._hot: "OrderedDict[str, Job]" = OrderedDict()
+
+        # Random per-process prefix + counter: unique for the process
+        # lifetime, and distinct from IDs issued by earlier runs in the DB.
+        # A random per-job suffix keeps IDs unguessable from one another,
+        # since an ID is all it takes to read a job's status and video.
+        self._id_prefix = secrets.token_hex(4)
+        self._id_counter = itertools.count()
+
+        # SSE subscribers: job_id -> {(loop, event)}, woken on every update
+        self._subscribers: dict[str, set] = {}
+        self._sub_lock = threading.Lock()
+
+        self._db: Optional[sqlite3.Connection] = None
     
-    def __init__(self):
-        self._jobs: dict[str, Job] = {}
-        self._lock = threading.Lock()
+    def open(self) -> None:
+        """Create the database file and schema. Call once before use."""
+        Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = self._connect()
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, prompt TEXT, style TEXT, seed INTEGER, "
+                "upscale INTEGER, num_frames INTEGER, status TEXT, result_path TEXT, "
+                "error TEXT, created_at REAL, duration_seconds REAL, finished_at REAL)"
+            )
+            # Databases from before finished_at was tracked
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+            if "finished_at" not in columns:
+                self._db.execute("ALTER TABLE jobs ADD COLUMN finished_at REAL")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """Per-thread read connection; WAL readers never block the writer."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
     
     def create(self, **kwargs) -> Job:
-        job_id = str(uuid.uuid4())[:8]
+        job_id = f"{self._id_prefix}{next(self._id_counter):06x}{secrets.token_hex(4)}"
         job = Job(job_id=job_id, **kwargs)
-        with self._lock:
-            self._jobs[job_id] = job
+        row = tuple(getattr(job, c) for c in _JOB_COLUMNS)
+        with self._write_lock:
+            with self._db:
+                self._db.execute(
+                    f"INSERT INTO jobs ({', '.join(_JOB_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(_JOB_COLUMNS))})",
+                    row,
+                )
+            self._hot[job_id] = job
+            if len(self._hot) > self.HOT_CACHE_SIZE:
+                self._hot.popitem(last=False)
         return job
     
     def get(self, job_id: str) -> Optional[Job]:
-        with self._lock:
-            return self._jobs.get(job_id)
+        job = self._hot.get(job_id)
+        if job:
+            return job
+
+        row = self._reader().execute(
+            f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs WHERE job_id = ?",
+            (job_id,),
+        ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    @staticmethod
+    def _row_to_job(row: tuple) -> Job:
+        data = dict(zip(_JOB_COLUMNS, row))
+        data["upscale"] = bool(data["upscale"])
+        return Job(**data)
+
+    def update(self, job_id: str, *, if_status: Optional[str] = None, **kwargs) -> bool:
+        """
+        Apply field changes to a job. With if_status, only if the job is
+        still in that status — checked and written in one statement, so a
+        concurrent update can't be overwritten. Returns whether a row changed.
+        """
+        unknown = set(kwargs) - set(_JOB_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+        if kwargs.get("status") in TERMINAL_STATUSES:
+            kwargs.setdefault("finished_at", time.time())
+
+        where, params = "WHERE job_id = ?", (job_id,)
+        if if_status is not None:
+            where, params = where + " AND status = ?", (job_id, if_status)
+
+        with self._write_lock:
+            with self._db:
+                changed = self._db.execute(
+                    f"UPDATE jobs SET {', '.join(f'{k} = ?' for k in kwargs)} {where}",
+                    (*kwargs.values(), *params),
+                ).rowcount
+            if not changed:
+                return False
+
+            old = self._hot.get(job_id)
+            if old:
+                job = replace(old, **kwargs)
+                if job.status in TERMINAL_STATUSES:
+                    del self._hot[job_id]
+                else:
+                    # Single reference swap — atomic for lock-free readers
+                    self._hot[job_id] = job
+                    self._hot.move_to_end(job_id)
+
+        self._notify(job_id)
+        return True
+
+    def reap(self, finished_before: float) -> list[Job]:
+        """Delete jobs that finished before the cutoff and return them."""
+        # Rows written before finished_at existed fall back to created_at
+        where = (
+            f"WHERE status IN ({', '.join('?' * len(TERMINAL_STATUSES))}) "
+            "AND COALESCE(finished_at, created_at) < ?"
+        )
+        params = (*TERMINAL_STATUSES, finished_before)
+
+        with self._write_lock:
+            with self._db:
+                rows = self._db.execute(
+                    f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs {where}", params
+                ).fetchall()
+                self._db.execute(f"DELETE FROM jobs {where}", params)
+
+            expired = [self._row_to_job(row) for row in rows]
+            for job in expired:
+                self._hot.pop(job.job_id, None)
+        return expired
     
-    def update(self, job_id: str, **kwargs) -> None:
-        with self._lock:
-            job = self._jobs.get(job_id)
-            if job:
-                for k, v in kwargs.items():
-                    setattr(job, k, v)
+    def subscribe(self, job_id: str) -> asyncio.Event:
+        """Get an event that is set whenever the job changes."""
+        event = asyncio.Event()
+        with self._sub_lock:
+            self._subscribers.setdefault(job_id, set()).add((asyncio.get_running_loop(), event))
+        return event
+
+    def unsubscribe(self, job_id: str, event: asyncio.Event) -> None:
+        with self._sub_lock:
+            waiters = self._subscribers.get(job_id, set())
+            waiters.difference_update({w for w in waiters if w[1] is event})
+            if not waiters:
+                self._subscribers.pop(job_id, None)
+
+    def _notify(self, job_id: str) -> None:
+        """Wake subscribers. Called from worker threads, so hop onto each loop."""
+        with self._sub_lock:
+            waiters = list(self._subscribers.get(job_id, ()))
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+
+# ─── GPU Worker Pool ──────────────────────────────────────────
+
+# One worker process per usable GPU (a GTX 1650 fits exactly one pipeline).
+# Jobs beyond that wait in the executor queue instead of piling up threads.
+GPU_WORKERS = int(os.getenv("VEDA_GPU_WORKERS", "1"))
+
+OUTPUT_DIR = Path("outputs/api")
+
+# Worker-process globals, set once by _init_worker
+_BASE_CONFIG = None
+_GENERATOR = None
+_GENERATOR_FRAMES = None
+_GENERATE_TAKES_NUM_FRAMES = False
+_EVENTS = None
+
+
+def _init_worker(events):
+    """Load the generator once per worker process."""
+    global _BASE_CONFIG, _GENERATOR, _GENERATOR_FRAMES, _GENERATE_TAKES_NUM_FRAMES, _EVENTS
+    from veda_engine.config import VEDAConfig
+    from veda_engine.generators import TextToVideoGenerator
+    
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+    _EVENTS = events
+    _BASE_CONFIG = VEDAConfig.for_gtx_1650()
+    _GENERATOR = TextToVideoGenerator(_BASE_CONFIG)
+    _GENERATOR_FRAMES = _BASE_CONFIG.num_frames
+    _GENERATE_TAKES_NUM_FRAMES = "num_frames" in inspect.signature(_GENERATOR.generate).parameters
 
-# ─── Background Worker ────────────────────────────────────────
 
-def _worker(job: Job, store: JobStore):
-    """Run generation in a background thread."""
-    from veda_engine.config import VEDAConfig
+def _generator_for(num_frames: int):
+    """
+    The resident generator, rebuilt if it was made for another frame count.
+
+    Only one pipeline fits on the GPU, so the old one is freed before the
+    new one loads; back-to-back jobs of the same length reuse it.
+    """
+    global _GENERATOR, _GENERATOR_FRAMES
+    if num_frames == _GENERATOR_FRAMES:
+        return _GENERATOR
+
+    import torch
     from veda_engine.generators import TextToVideoGenerator
-    
-    store.update(job.job_id, status="running")
+
+    _GENERATOR = _GENERATOR_FRAMES = None
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+    _GENERATOR = TextToVideoGenerator(replace(_BASE_CONFIG, num_frames=num_frames))
+    _GENERATOR_FRAMES = num_frames
+    return _GENERATOR
+
+
+def _worker(job: dict) -> dict:
+    """Run generation inside a pool worker. Returns the fields to store."""
+    _EVENTS.put(job["job_id"])
     start = time.time()
     
     try:
-        config = VEDAConfig.for_gtx_1650()
-        
-        # Override frames if specified
-        if job.num_frames:
-            config.num_frames = job.num_frames
+        num_frames = job["num_frames"] or _BASE_CONFIG.num_frames
+        if _GENERATE_TAKES_NUM_FRAMES:
+            generator, overrides = _GENERATOR, {}
+            if num_frames != _BASE_CONFIG.num_frames:
+                overrides["num_frames"] = num_frames
+        else:
+            # The generator may have copied its config at construction, so a
+            # different frame count needs a rebuilt one (the shared base
+            # config is never mutated)
+            generator, overrides = _generator_for(num_frames), {}
         
-        generator = TextToVideoGenerator(config)
-        
-        # Generate output path
-        output_dir = Path("outputs/api")
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_path = output_dir / f"{job.job_id}.mp4"
+        output_path = OUTPUT_DIR / f"{job['job_id']}.mp4"
         
         result = generator.generate(
-            prompt=job.prompt,
+            prompt=job["prompt"],
             output_path=str(output_path),
-            style=job.style,
-            seed=job.seed,
-            upscale=job.upscale,
+            style=job["style"],
+            seed=job["seed"],
+            upscale=job["upscale"],
+            **overrides,
         )
         
-        duration = round(time.time() - start, 1)
-        store.update(
-            job.job_id,
-            status="completed",
-            result_path=str(result),
-            duration_seconds=duration,
-        )
-        logger.info(f"Job {job.job_id} completed in {duration}s")
+        return {
+            "status": "completed",
+            "result_path": str(result),
+            "duration_seconds": round(time.time() - start, 1),
+        }
         
     except Exception as e:
-        duration = round(time.time() - start, 1)
-        store.update(
-            job.job_id,
-            status="failed",
-            error=str(e),
-            duration_seconds=duration,
-        )
-        logger.error(f"Job {job.job_id} failed: {e}")
+        return {
+            "status": "failed",
+            "error": str(e),
+            "duration_seconds": round(time.time() - start, 1),
+        }
+
+
+def _on_job_done(job_id: str, fut: Future) -> None:
+    """Record a finished job. Runs in the executor's management thread."""
+    try:
+        outcome = fut.result()
+    except BrokenProcessPool:
+        # The worker process died mid-job (OOM kill, driver reset, crash);
+        # the next submit replaces the pool
+        outcome = {"status": "failed", "error": "Generation worker died while running this job"}
+    except Exception as e:
+        # Worker died or failed to initialize (e.g. OOM while loading weights)
+        outcome = {"status": "failed", "error": str(e)}
+
+    store.update(job_id, **outcome)
+
+    if outcome["status"] == "completed":
+        logger.info(f"Job {job_id} completed in {outcome['duration_seconds']}s")
+    else:
+        logger.error(f"Job {job_id} failed: {outcome['error']}")
+
+
+def _reap_expired_jobs() -> int:
+    """Drop finished jobs past the TTL and delete their videos."""
+    expired = store.reap(time.time() - JOB_TTL_SECONDS)
+    for job in expired:
+        if job.result_path:
+            Path(job.result_path).unlink(missing_ok=True)
+    return len(expired)
+
+
+async def _reaper_loop() -> None:
+    while True:
+        await asyncio.sleep(REAP_INTERVAL_SECONDS)
+        try:
+            count = await asyncio.to_thread(_reap_expired_jobs)
+        except Exception as e:
+            logger.error(f"Job cleanup failed: {e}")
+            continue
+        if count:
+            logger.info(f"Removed {count} expired jobs")
+
+
+def _drain_events() -> None:
+    """Mirror worker-side "running" notifications into the job store."""
+    while True:
+        job_id = _EVENTS_QUEUE.get()
+        # Conditional: the job may already have finished (or failed) by now
+        store.update(job_id, status="running", if_status="queued")
+
+
+# Spawn (not fork) so CUDA is initialized cleanly inside the worker
+_MP_CONTEXT = mp.get_context("spawn")
+_EVENTS_QUEUE = _MP_CONTEXT.SimpleQueue()
+
+
+def _new_executor() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=GPU_WORKERS,
+        mp_context=_MP_CONTEXT,
+        initializer=_init_worker,
+        initargs=(_EVENTS_QUEUE,),
+    )
+
+
+EXECUTOR = _new_executor()
+
+
+def _submit(job: Job) -> Future:
+    """Queue a job on the worker pool, replacing the pool once if it broke."""
+    global EXECUTOR
+    try:
+        return EXECUTOR.submit(_worker, asdict(job))
+    except BrokenProcessPool:
+        # A dead worker breaks the pool for good; start a fresh one. Only
+        # called from the event loop, so there is no race on the swap.
+        logger.warning("GPU worker pool is broken; starting a new one")
+        EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        EXECUTOR = _new_executor()
+        return EXECUTOR.submit(_worker, asdict(job))
+
+
+# ─── Range Requests ───────────────────────────────────────────
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+RANGE_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+def _parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single-range ``Range: bytes=start-end`` header (RFC 7233).
+
+    Returns an inclusive (start, end) pair, or None if the header should be
+    ignored (malformed, multi-range, or last < first) and the whole file
+    sent instead. Raises ValueError if the range starts past the end.
+    """
+    match = _RANGE_RE.fullmatch(header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        # Syntactically invalid, so the header is ignored (RFC 7233 2.1)
+        return None
+    if start >= size:
+        raise ValueError("range not satisfiable")
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def _iter_range(path: str, start: int, end: int, chunk_size: int = RANGE_CHUNK_SIZE):
+    """Yield bytes start..end (inclusive) of a file in chunks."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
 
 
 # ─── FastAPI App ───────────────────────────────────────────────
@@ -156,10 +530,42 @@ app = FastAPI(
     title="VEDA Video Generation API",
     description="AI-powered video generation engine — REST API",
     version="0.2.0",
+    default_response_class=ORJSONResponse,
 )
 
 store = JobStore()
 
+# Styles never change at runtime — serialize the response body once
+_STYLES_JSON = orjson.dumps({"styles": _BRAIN.get_styles()}) if _BRAIN else None
+
+
+@app.on_event("startup")
+async def _open_job_store():
+    # Opened here rather than at import, so importing the module has no
+    # side effects on the filesystem
+    store.open()
+
+
+@app.on_event("startup")
+async def _tune_threadpool():
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_TOKENS
+
+
+@app.on_event("startup")
+async def _start_event_drain():
+    threading.Thread(target=_drain_events, daemon=True).start()
+
+
+@app.on_event("startup")
+async def _start_reaper():
+    if JOB_TTL_SECONDS > 0:
+        app.state.reaper = asyncio.create_task(_reaper_loop())
+
+
+@app.on_event("shutdown")
+async def _stop_executor():
+    EXECUTOR.shutdown(wait=False, cancel_futures=True)
+
 
 @app.get("/")
 async def root():
@@ -171,6 +577,7 @@ async def root():
         "endpoints": [
             "POST /api/generate",
             "GET /api/status/{job_id}",
+            "GET /api/events/{job_id}",
             "GET /api/download/{job_id}",
             "GET /api/styles",
         ]
@@ -191,13 +598,13 @@ async def generate(request: GenerateRequest):
         num_frames=request.num_frames,
     )
     
-    # Start generation in background thread
-    thread = threading.Thread(
-        target=_worker,
-        args=(job, store),
-        daemon=True,
-    )
-    thread.start()
+    # Queue on the GPU worker pool
+    try:
+        fut = _submit(job)
+    except BrokenProcessPool as e:
+        store.update(job.job_id, status="failed", error=str(e))
+        raise HTTPException(status_code=503, detail="Generation worker is unavailable")
+    fut.add_done_callback(partial(_on_job_done, job.job_id))
     
     logger.info(f"Job {job.job_id} submitted: {request.prompt[:50]}...")
     
@@ -208,7 +615,17 @@ async def generate(request: GenerateRequest):
     )
 
 
-@app.get("/api/status/{job_id}", response_model=JobStatusResponse)
+def _job_status(job: Job) -> JobStatusResponse:
+    return JobStatusResponse(
+        job_id=job.job_id,
+        status=job.status,
+        result_path=job.result_path,
+        error=job.error,
+        duration_seconds=job.duration_seconds if job.duration_seconds > 0 else None,
+    )
+
+
+@app.get("/api/status/{job_id}")
 async def get_status(job_id: str):
     """Get the current status of a generation job."""
     job = store.get(job_id)
@@ -216,18 +633,53 @@ async def get_status(job_id: str):
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
-    return JobStatusResponse(
-        job_id=job.job_id,
-        status=job.status,
-        result_path=job.result_path,
-        error=job.error,
-        duration_seconds=job.duration_seconds if job.duration_seconds > 0 else None,
+    return Response(
+        content=_STATUS_ENCODER.encode(_job_status(job)),
+        media_type="application/json",
+    )
+
+
+@app.get("/api/events/{job_id}")
+async def job_events(job_id: str):
+    """
+    Stream job status as server-sent events.
+    Pushes one event per state change and closes once the job finishes.
+    """
+    if not store.get(job_id):
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    async def stream():
+        event = store.subscribe(job_id)
+        try:
+            while True:
+                # Clear before reading so an update racing the read re-wakes us
+                event.clear()
+                job = store.get(job_id)
+                if not job:
+                    return
+
+                payload = _STATUS_ENCODER.encode(_job_status(job))
+                yield b"data: " + payload + b"\n\n"
+                if job.status in TERMINAL_STATUSES:
+                    return
+
+                try:
+                    await asyncio.wait_for(event.wait(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            store.unsubscribe(job_id, event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
     )
 
 
 @app.get("/api/download/{job_id}")
-async def download(job_id: str):
-    """Download a completed video."""
+async def download(job_id: str, request: Request):
+    """Download a completed video. Supports Range requests for seeking."""
     job = store.get(job_id)
     
     if not job:
@@ -242,20 +694,47 @@ async def download(job_id: str):
     if not job.result_path or not Path(job.result_path).exists():
         raise HTTPException(status_code=404, detail="Video file not found")
     
-    return FileResponse(
-        path=job.result_path,
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="veda_{job_id}.mp4"',
+    }
+    size = os.stat(job.result_path).st_size
+    range_header = request.headers.get("range")
+
+    try:
+        byte_range = _parse_range(range_header, size) if range_header else None
+    except ValueError:
+        return Response(
+            status_code=416,
+            headers={"Content-Range": f"bytes */{size}", "Accept-Ranges": "bytes"},
+        )
+
+    if byte_range is None:
+        return FileResponse(
+            path=job.result_path,
+            media_type="video/mp4",
+            headers=headers,
+        )
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        _iter_range(job.result_path, start, end),
+        status_code=206,
         media_type="video/mp4",
-        filename=f"veda_{job_id}.mp4",
+        headers=headers,
     )
 
 
 @app.get("/api/styles", response_model=StylesResponse)
 async def list_styles():
     """List available style presets."""
-    from veda_engine.core.prompt_brain import PromptBrain
+    if _STYLES_JSON is None:
+        raise HTTPException(status_code=503, detail="Prompt Brain is not installed")
     
-    brain = PromptBrain()
-    return StylesResponse(styles=brain.get_styles())
+    return Response(content=_STYLES_JSON, media_type="application/json")
 
 
 # ─── CLI Runner ────────────────────────────────────────────────
@@ -2,11 +2,49 @@
 VEDA Colab Client - Connect to Colab's Gradio API for remote video generation.
 """
 
+from __future__ import annotations
+
 from gradio_client import Client
-from typing import Optional, Tuple
+from gradio_client.client import Job
+from typing import List, Optional, Tuple
+from pathlib import Path
+from urllib.parse import urlparse
+import asyncio
+import contextlib
+import hashlib
+import httpx
+import inspect
 import os
 import tempfile
-import shutil
+
+
+NOT_CONNECTED_MESSAGE = "❌ Not connected to Colab. Please enter URL and connect first."
+JOB_POLL_SECONDS = 0.1
+PROBE_TIMEOUT_SECONDS = 10
+# Cap on jobs rendering on Colab at once across all async callers
+MAX_INFLIGHT = int(os.getenv("VEDA_COLAB_MAX_INFLIGHT", "4"))
+
+# gradio_client issues one-off httpx calls; bound connect time so a dead
+# tunnel fails fast, but leave room for slow uploads/downloads
+GRADIO_HTTPX_KWARGS = {"timeout": httpx.Timeout(600, connect=PROBE_TIMEOUT_SECONDS)}
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=100)
+
+# Client options newer gradio_client releases accept; older ones get only
+# what they support (and then download outputs themselves)
+_CLIENT_PARAMS = inspect.signature(Client.__init__).parameters
+CLIENT_KWARGS = {
+    name: value
+    for name, value in {"httpx_kwargs": GRADIO_HTTPX_KWARGS, "download_files": False}.items()
+    if name in _CLIENT_PARAMS
+}
+
+# Videos are streamed into Gradio's upload folder, which the UI serves
+# without copying, in chunks large enough to keep the socket busy over WAN
+DOWNLOAD_DIR = Path(os.environ.get("GRADIO_TEMP_DIR") or Path(tempfile.gettempdir()) / "gradio").resolve() / "veda"
+DOWNLOAD_CHUNK_BYTES = 1 << 20
+
+# Endpoint names the Colab notebook's generate function may be exposed as
+GENERATE_API_NAMES = ("/generate", "/generate_0", "/generate_video")
 
 
 class ColabClient:
@@ -19,6 +57,38 @@ class ColabClient:
         self.client: Optional[Client] = None
         self.colab_url: Optional[str] = None
         self._is_connected = False
+        self._http: Optional[httpx.AsyncClient] = None
+        # submit() kwargs selecting the generate endpoint, once known
+        self._endpoint: Optional[dict] = None
+        self._inflight: Optional[asyncio.Semaphore] = None
+
+    @staticmethod
+    def _normalize_url(colab_url: str) -> str:
+        # Clean the URL
+        url = colab_url.strip()
+
+        # Add https if missing
+        if url and not url.startswith("http"):
+            url = f"https://{url}"
+        return url
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Shared async HTTP client, so repeated requests reuse pooled connections."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=PROBE_TIMEOUT_SECONDS,
+                limits=HTTP_LIMITS,
+                follow_redirects=True,
+            )
+        return self._http
+
+    @property
+    def inflight(self) -> asyncio.Semaphore:
+        """Bounds in-flight Colab jobs, created on first use inside the event loop."""
+        if self._inflight is None:
+            self._inflight = asyncio.Semaphore(MAX_INFLIGHT)
+        return self._inflight
     
     def connect(self, colab_url: str) -> Tuple[bool, str]:
         """
@@ -31,19 +101,18 @@ class ColabClient:
             Tuple of (success, message)
         """
         try:
-            # Clean the URL
-            url = colab_url.strip()
+            url = self._normalize_url(colab_url)
             if not url:
                 return False, "❌ Please enter a Colab URL"
             
-            # Add https if missing
-            if not url.startswith("http"):
-                url = f"https://{url}"
-            
-            # Try to connect
-            self.client = Client(url)
+            # Try to connect, replacing (and stopping) any previous client.
+            # Outputs come back as URLs; fetch() streams them itself.
+            client = Client(url, **CLIENT_KWARGS)
+            self._close_client()
+            self.client = client
             self.colab_url = url
             self._is_connected = True
+            self._endpoint = self._discover_endpoint()
             
             return True, f"✅ Connected to Colab!"
             
@@ -51,16 +120,132 @@ class ColabClient:
             self._is_connected = False
             return False, f"❌ Connection failed: {str(e)}"
     
+    async def connect_async(self, colab_url: str) -> Tuple[bool, str]:
+        """
+        Async variant of connect() for Gradio's event loop.
+
+        Probes the endpoint first so a dead share link fails fast without
+        tying up a thread, then runs the blocking client setup off the loop.
+        """
+        url = self._normalize_url(colab_url)
+        if not url:
+            return False, "❌ Please enter a Colab URL"
+
+        try:
+            resp = await self.http.get(f"{url.rstrip('/')}/config")
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            self._is_connected = False
+            return False, f"❌ Colab not reachable: {str(e)}"
+
+        return await asyncio.to_thread(self.connect, url)
+
+    def _discover_endpoint(self) -> Optional[dict]:
+        """Pick the generate endpoint from the API listing, without trial calls."""
+        try:
+            named = self.client.view_api(print_info=False, return_format="dict")["named_endpoints"]
+        except Exception:
+            return None  # fall back to probing on first generate
+        for api_name in GENERATE_API_NAMES:
+            if api_name in named:
+                return {"api_name": api_name}
+        return {"api_name": next(iter(named))} if named else None
+
+    def _close_client(self):
+        # Each gradio Client runs a heartbeat thread until closed (older
+        # releases have neither the thread nor close())
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
     def disconnect(self):
         """Disconnect from Colab."""
+        self._close_client()
         self.client = None
         self.colab_url = None
         self._is_connected = False
+        self._endpoint = None
     
     @property
     def is_connected(self) -> bool:
         return self._is_connected and self.client is not None
     
+    def _submit(
+        self,
+        prompt: str,
+        style: str,
+        frames: int,
+        seed: int,
+        upscale: bool
+    ) -> Tuple[Optional[Job], Optional[str]]:
+        """
+        Queue a generation job on Colab without waiting for it.
+
+        Returns:
+            Tuple of (job or None, last endpoint lookup error)
+        """
+        args = (prompt, style.lower(), frames, seed, upscale)
+
+        if self._endpoint is not None:
+            return self.client.submit(*args, **self._endpoint), None
+
+        # Try different API endpoint names that Gradio might use
+        endpoints_to_try = [
+            {},  # Use default/first endpoint
+            *({"api_name": api_name} for api_name in GENERATE_API_NAMES),
+            {"fn_index": 0},  # First function by index
+        ]
+
+        last_error = None
+
+        for endpoint in endpoints_to_try:
+            try:
+                job = self.client.submit(*args, **endpoint)
+                self._endpoint = endpoint
+                return job, None
+            except Exception as e:
+                last_error = str(e)
+                if "Cannot find" not in last_error:
+                    # Different error, re-raise
+                    raise
+                continue
+
+        return None, last_error
+
+    def fetch(self, job: Job) -> Tuple[str, Optional[str]]:
+        """Collect a submitted job's output, bringing the video local."""
+        status, video_url = self._parse_result(job.result())
+        return status, self._download_video(video_url) if video_url else None
+
+    async def fetch_async(self, job: Job) -> Tuple[str, Optional[str]]:
+        """fetch() for the event loop, downloading over the shared connection pool."""
+        status, video_url = self._parse_result(job.result())
+        return status, await self._download_video_async(video_url) if video_url else None
+
+    @staticmethod
+    def _parse_result(result) -> Tuple[str, Optional[str]]:
+        """Turn the raw endpoint output into (status_message, video URL or path)."""
+        # Result is typically (status_text, video)
+        if isinstance(result, tuple) and len(result) >= 2:
+            status, video = result[0], result[1]
+        else:
+            # Single return value
+            status, video = "✅ Generated!", result
+
+        # A Video output arrives as {"video": FileData, "subtitles": ...}
+        if isinstance(video, dict):
+            video = video.get("video", video)
+            if isinstance(video, dict):
+                video = video.get("url") or video.get("path")
+        return status, video if isinstance(video, str) and video else None
+
+    @staticmethod
+    def _error_result(e: Exception) -> Tuple[str, Optional[str]]:
+        error_msg = str(e)
+        if "queue" in error_msg.lower():
+            return "⏳ Colab is busy. Please wait and try again.", None
+        return f"❌ Generation failed: {error_msg}", None
+
     def generate(
         self,
         prompt: str,
@@ -83,91 +268,116 @@ class ColabClient:
             Tuple of (status_message, video_path or None)
         """
         if not self.is_connected:
-            return "❌ Not connected to Colab. Please enter URL and connect first.", None
+            return NOT_CONNECTED_MESSAGE, None
         
         try:
-            # Try different API endpoint names that Gradio might use
-            api_names_to_try = [
-                None,  # Use default/first endpoint
-                "/generate",
-                "/generate_0", 
-                "/generate_video",
-                0,  # First function by index
-            ]
-            
-            result = None
-            last_error = None
-            
-            for api_name in api_names_to_try:
-                try:
-                    if api_name is None:
-                        # Try calling without specifying api_name (uses first available)
-                        result = self.client.predict(
-                            prompt,
-                            style.lower(),
-                            frames,
-                            seed,
-                            upscale,
-                        )
-                    elif isinstance(api_name, int):
-                        # Try by index
-                        result = self.client.predict(
-                            prompt,
-                            style.lower(),
-                            frames,
-                            seed,
-                            upscale,
-                            fn_index=api_name
-                        )
-                    else:
-                        result = self.client.predict(
-                            prompt,
-                            style.lower(),
-                            frames,
-                            seed,
-                            upscale,
-                            api_name=api_name
-                        )
-                    break  # Success!
-                except Exception as e:
-                    last_error = str(e)
-                    if "Cannot find" not in last_error:
-                        # Different error, re-raise
-                        raise
-                    continue
-            
-            if result is None:
+            job, last_error = self._submit(prompt, style, frames, seed, upscale)
+            if job is None:
                 return f"❌ Could not find generate endpoint: {last_error}", None
+            return self.fetch(job)
+        except Exception as e:
+            return self._error_result(e)
+
+    async def generate_async(
+        self,
+        prompt: str,
+        style: str = "cinematic",
+        frames: int = 16,
+        seed: int = 42,
+        upscale: bool = True,
+        limiter: Optional[asyncio.Semaphore] = None
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Async variant of generate() for Gradio's event loop.
+
+        The job runs on the gradio_client's own connection; we only poll it,
+        so the caller never ties up a worker thread while Colab renders. At
+        most MAX_INFLIGHT jobs render at once; later calls wait their turn.
+
+        Args:
+            limiter: Optional semaphore held from submission until Colab
+                finishes the job. Fetching the output happens after it is
+                released, so the next job can start rendering meanwhile.
+        """
+        if not self.is_connected:
+            return NOT_CONNECTED_MESSAGE, None
+
+        try:
+            async with (limiter or contextlib.nullcontext()), self.inflight:
+                job, last_error = self._submit(prompt, style, frames, seed, upscale)
+                if job is None:
+                    return f"❌ Could not find generate endpoint: {last_error}", None
+                while not job.done():
+                    await asyncio.sleep(JOB_POLL_SECONDS)
+            return await self.fetch_async(job)
+        except Exception as e:
+            return self._error_result(e)
+
+    async def generate_batch(
+        self,
+        prompts: List[str],
+        styles: List[str],
+        frames: List[int],
+        seeds: List[int],
+        upscales: List[bool]
+    ) -> List[Tuple[str, Optional[str]]]:
+        """
+        Generate several videos at once, one result per prompt in input order.
+
+        The Colab endpoint takes a single prompt per call, so the items are
+        submitted together and queue back-to-back on the remote GPU.
+        """
+        return await asyncio.gather(*(
+            self.generate_async(prompt, style, n_frames, seed, upscale)
+            for prompt, style, n_frames, seed, upscale
+            in zip(prompts, styles, frames, seeds, upscales)
+        ))
+
+    @staticmethod
+    def _local_path(remote_url: str) -> Path:
+        """Download target for a remote file; Gradio gives each output a unique URL."""
+        DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        suffix = os.path.splitext(urlparse(remote_url).path)[1] or ".mp4"
+        return DOWNLOAD_DIR / f"{hashlib.sha1(remote_url.encode('utf-8')).hexdigest()}{suffix}"
+
+    def _download_video(self, remote_path: str) -> Optional[str]:
+        """Stream a video from Gradio's file server to a local file, chunk by chunk."""
+        try:
+            # Local paths (e.g. a client that downloaded itself) pass through
+            if os.path.exists(remote_path) or not remote_path.startswith(("http://", "https://")):
+                return remote_path
             
-            # Result is typically (status_text, video_path)
-            if isinstance(result, tuple) and len(result) >= 2:
-                status, video_path = result[0], result[1]
-                
-                if video_path:
-                    # Copy to local temp file if it's a remote path
-                    local_path = self._download_video(video_path)
-                    return status, local_path
-                
-                return status, None
-            
-            # Single return value
-            return "✅ Generated!", result if isinstance(result, str) else None
+            local_path = self._local_path(remote_path)
+            if not local_path.exists():
+                partial_path = local_path.with_suffix(".partial" + local_path.suffix)
+                with httpx.stream("GET", remote_path, follow_redirects=True, **GRADIO_HTTPX_KWARGS) as resp:
+                    resp.raise_for_status()
+                    with open(partial_path, "wb") as f:
+                        for chunk in resp.iter_bytes(DOWNLOAD_CHUNK_BYTES):
+                            f.write(chunk)
+                os.replace(partial_path, local_path)
+            return str(local_path)
             
         except Exception as e:
-            error_msg = str(e)
-            if "queue" in error_msg.lower():
-                return "⏳ Colab is busy. Please wait and try again.", None
-            return f"❌ Generation failed: {error_msg}", None
+            print(f"Download error: {e}")
+            return None
     
-    def _download_video(self, remote_path: str) -> Optional[str]:
-        """Download video from Gradio's file server to local temp."""
+    async def _download_video_async(self, remote_path: str) -> Optional[str]:
+        """_download_video() over the shared async client, so TLS and keep-alive are reused."""
         try:
-            # If it's already a local path, return it
-            if os.path.exists(remote_path):
+            if os.path.exists(remote_path) or not remote_path.startswith(("http://", "https://")):
                 return remote_path
             
-            # For Gradio, the path is already downloaded by the client
-            return remote_path
+            local_path = self._local_path(remote_path)
+            if not local_path.exists():
+                partial_path = local_path.with_suffix(".partial" + local_path.suffix)
+                async with self.http.stream("GET", remote_path, **GRADIO_HTTPX_KWARGS) as resp:
+                    resp.raise_for_status()
+                    with open(partial_path, "wb") as f:
+                        async for chunk in resp.aiter_bytes(DOWNLOAD_CHUNK_BYTES):
+                            f.write(chunk)
+                os.replace(partial_path, local_path)
+            return str(local_path)
             
         except Exception as e:
             print(f"Download error: {e}")
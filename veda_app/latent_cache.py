@@ -0,0 +1,184 @@
+"""
+VEDA Latent Cache - Resume diffusion from a similar prompt's intermediate latents.
+
+A prompt whose CLIP embedding is close to one generated before skips the
+first denoising steps: the pipe starts from that run's latents at a later
+step instead of from pure noise. The closer the prompts, the more steps are
+skipped. Only fully denoised (non-resumed) runs are recorded, so
+approximations never compound.
+
+Resuming trades exactness for speed, so it only ever happens between runs
+with the same seed, guidance and negative prompt; unseeded runs bypass it.
+"""
+
+import contextlib
+import inspect
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import torch
+
+# (min cosine similarity, fraction of steps to skip), most aggressive first
+DEFAULT_SKIP_LEVELS = ((0.95, 0.5), (0.90, 0.35), (0.85, 0.2))
+DEFAULT_MAX_ENTRIES = 300
+
+
+@dataclass
+class _Entry:
+    key: Tuple
+    embedding: torch.Tensor
+    # step index -> latents ready to enter that step (kept on CPU)
+    checkpoints: Dict[int, torch.Tensor] = field(default_factory=dict)
+
+
+@contextlib.contextmanager
+def _skip_first_steps(scheduler, skip: int):
+    """Drop the first `skip` timesteps whenever the pipe sets up the schedule."""
+    original = scheduler.set_timesteps
+
+    def set_timesteps(*args, **kwargs):
+        original(*args, **kwargs)
+        scheduler.timesteps = scheduler.timesteps[skip:]
+
+    scheduler.set_timesteps = set_timesteps
+    try:
+        yield
+    finally:
+        del scheduler.set_timesteps
+
+
+class LatentCache:
+    """
+    Approximate prompt cache in front of a diffusers text-to-video pipe.
+
+    Entries are keyed by everything besides the prompt that determines the
+    output (steps, frames, size, guidance, negative prompt, seed) and matched
+    by cosine similarity of the prompt's pooled CLIP embedding. Least
+    recently used entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        pipe,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        skip_levels=DEFAULT_SKIP_LEVELS
+    ):
+        self.pipe = pipe
+        self.max_entries = max_entries
+        self.skip_levels = skip_levels
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._next_id = 0
+
+    @staticmethod
+    def supports(pipe) -> bool:
+        """
+        Whether resuming is sound for this pipe.
+
+        Needs a CLIP text encoder, step-end callbacks to capture latents, and
+        a scheduler that does not rescale user-supplied latents.
+        """
+        if getattr(pipe, "text_encoder", None) is None or getattr(pipe, "tokenizer", None) is None:
+            return False
+        params = inspect.signature(pipe.__call__).parameters
+        if "latents" not in params or "callback_on_step_end" not in params:
+            return False
+        return float(getattr(pipe.scheduler, "init_noise_sigma", 1.0)) == 1.0
+
+    @torch.inference_mode()
+    def embed(self, prompt: str) -> torch.Tensor:
+        """Unit-norm pooled CLIP text embedding, on CPU."""
+        tokens = self.pipe.tokenizer(
+            prompt,
+            padding="max_length",
+            max_length=self.pipe.tokenizer.model_max_length,
+            truncation=True,
+            return_tensors="pt",
+        )
+        device = getattr(self.pipe, "_execution_device", self.pipe.device)
+        pooled = self.pipe.text_encoder(tokens.input_ids.to(device)).pooler_output[0]
+        return torch.nn.functional.normalize(pooled.float(), dim=0).cpu()
+
+    @staticmethod
+    def _seed(generator) -> Optional[Tuple[int, ...]]:
+        """Seeds of the generator(s) passed to the pipe, or None if unseeded."""
+        if generator is None:
+            return None
+        generators = generator if isinstance(generator, (list, tuple)) else [generator]
+        return tuple(g.initial_seed() for g in generators)
+
+    def _skip_steps(self, steps: int):
+        """Step indices a checkpoint is kept at, one per skip level."""
+        return {
+            min(int(steps * fraction), steps - 1)
+            for _, fraction in self.skip_levels
+            if int(steps * fraction) >= 1
+        }
+
+    def _lookup(self, key: Tuple, embedding: torch.Tensor, steps: int) -> Optional[Tuple[int, torch.Tensor]]:
+        candidates = [(i, e) for i, e in self._entries.items() if e.key == key]
+        if not candidates:
+            return None
+
+        sims = torch.stack([e.embedding for _, e in candidates]) @ embedding
+        best = int(sims.argmax())
+        sim = float(sims[best])
+        entry_id, entry = candidates[best]
+
+        for min_sim, fraction in self.skip_levels:
+            skip = min(int(steps * fraction), steps - 1)
+            if sim >= min_sim and skip in entry.checkpoints:
+                self._entries.move_to_end(entry_id)
+                return skip, entry.checkpoints[skip]
+        return None
+
+    def _insert(self, entry: _Entry) -> None:
+        self._entries[self._next_id] = entry
+        self._next_id += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __call__(self, **kwargs):
+        """
+        Run the pipe with the given keyword arguments, resuming from the
+        nearest cached prompt when one is similar enough.
+        """
+        seed = self._seed(kwargs.get("generator"))
+        if seed is None:
+            # Another random draw is expected; a resumed run would repeat the last one
+            return self.pipe(**kwargs)
+
+        steps = int(kwargs["num_inference_steps"])
+        negative_prompt = kwargs.get("negative_prompt")
+        key = (
+            steps, kwargs.get("num_frames"), kwargs.get("height"), kwargs.get("width"),
+            kwargs.get("guidance_scale"),
+            tuple(negative_prompt) if isinstance(negative_prompt, list) else negative_prompt,
+            seed,
+        )
+        embedding = self.embed(kwargs["prompt"])
+
+        hit = self._lookup(key, embedding, steps)
+        if hit is not None:
+            skip, latents = hit
+            device = getattr(self.pipe, "_execution_device", self.pipe.device)
+            with _skip_first_steps(self.pipe.scheduler, skip):
+                return self.pipe(**kwargs, latents=latents.to(device))
+
+        # Full run: record the latents entering each checkpoint step
+        entry = _Entry(key=key, embedding=embedding)
+        wanted = self._skip_steps(steps)
+
+        def record(pipe, i, t, callback_kwargs):
+            if i + 1 in wanted:
+                entry.checkpoints[i + 1] = callback_kwargs["latents"].detach().to("cpu", copy=True)
+            return callback_kwargs
+
+        output = self.pipe(
+            **kwargs,
+            callback_on_step_end=record,
+            callback_on_step_end_tensor_inputs=["latents"],
+        )
+        if entry.checkpoints:
+            self._insert(entry)
+        return output